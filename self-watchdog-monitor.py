@@ -11,13 +11,18 @@ LOG_FILE = "system_monitor.log"
 import psutil
 import time
 import logging
-from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import socket
 import platform
 import os
-import threading
-import subprocess
+import heapq
+import glob
+import functools
+import random
+import re
+import sys
 
 # Create log directory if it doesn't exist
 try:
@@ -34,6 +39,102 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# Telegram message layout; header holds the static server/OS/arch lines
+ICONS = {"alert": "⚠", "status": "ℹ"}
+MSG_TEMPLATE = (
+    "{icon} <b>{title}</b>\n\n"
+    "{header}"
+    "🕒 Time: {timestamp}\n\n"
+    "📊 System Metrics:\n"
+    "CPU Usage: {cpu_percent}\n"
+    "CPU Frequency: {cpu_freq}\n"
+    "CPU Temperature: {cpu_temp}\n"
+    "RAM Used: {memory_used}/{memory_total} ({memory_percent}%)\n"
+    "Swap Used: {swap_used} ({swap_percent}%)\n"
+    "Network: {network_speed}\n\n"
+    "Storage Usage:\n{disk_info}"
+)
+
+# PRETTY_NAME line of /etc/os-release, quotes optional
+_OSR_RE = re.compile(rb'^PRETTY_NAME="?([^"\n]+)"?', re.M)
+
+# Fields needed from /proc/meminfo, matched in a single pass
+_MEMINFO_RE = re.compile(rb'^(MemTotal|MemAvailable|SwapTotal|SwapFree):\s+(\d+)', re.M)
+
+def _open_proc(path):
+    """Open a /proc file for repeated pread calls, None if unavailable"""
+    if sys.platform != 'linux':
+        return None
+    try:
+        return os.open(path, os.O_RDONLY)
+    except OSError as e:
+        logging.warning(f"Cannot open {path}, falling back to psutil: {e}")
+        return None
+
+def _ttl_cache(seconds):
+    """Reuse a method's last result until it is older than `seconds`"""
+    def decorator(func):
+        attr = f"_{func.__name__}_cache"
+
+        @functools.wraps(func)
+        def wrapper(self):
+            cached = getattr(self, attr, None)
+            if cached is not None and time.monotonic() - cached[0] < seconds:
+                return cached[1]
+            result = func(self)
+            setattr(self, attr, (time.monotonic(), result))
+            return result
+        return wrapper
+    return decorator
+
+def _get_retry_after(response, default=5):
+    """Get the wait in seconds from a Telegram 429 response"""
+    header = response.headers.get('Retry-After', '')
+    if header.isdigit():
+        return int(header)
+    try:
+        return int(response.json().get('parameters', {}).get('retry_after', default))
+    except ValueError:
+        return default
+
+def _or_na(value, unit=""):
+    """Show a metric with its unit in messages, N/A when missing"""
+    return "N/A" if value is None else f"{value}{unit}"
+
+def _fmt_gb(n, precision=2):
+    """Format a byte count as GB for messages"""
+    if n is None:
+        return "N/A"
+    return f"{n / (1 << 30):.{precision}f}GB"
+
+@functools.lru_cache(maxsize=1)
+def get_os_info():
+    """Get detailed OS information (detected once per process)"""
+    try:
+        if platform.system() == "Linux":
+            # Read PRETTY_NAME straight from os-release, no subprocess
+            try:
+                with open("/etc/os-release", "rb") as f:
+                    match = _OSR_RE.search(f.read())
+                if match:
+                    return match.group(1).decode()
+            except (OSError, UnicodeDecodeError):
+                pass
+
+            # Fallback to platform parser (Python 3.10+)
+            try:
+                pretty_name = platform.freedesktop_os_release().get("PRETTY_NAME")
+                if pretty_name:
+                    return pretty_name
+            except (AttributeError, OSError):
+                pass
+
+        # Fallback to basic platform info
+        return f"{platform.system()} {platform.release()}"
+    except Exception as e:
+        logging.error(f"Error getting OS info: {e}")
+        return f"{platform.system()} {platform.release()}"
+
 class SystemMonitor:
     def __init__(self):
         """Initialize SystemMonitor"""
@@ -41,9 +142,29 @@ class SystemMonitor:
         self.alert_interval = ALERT_INTERVAL
         self.status_interval = STATUS_INTERVAL * 3600
         self.server_name = SERVER_NAME
-        self.os_info = self._get_os_info()
+        self.os_info = get_os_info()
         self.arch_info = platform.machine()
+        # Static part of every message, fixed for the process lifetime
+        self._msg_header = (
+            f"🖥 Server: <b>{self.server_name}</b>\n"
+            f"💻 OS: {self.os_info}\n"
+            f"🔧 Architecture: {self.arch_info}\n"
+        )
         self.prev_network_bytes = self._get_network_bytes()
+        self.prev_net_ts = time.monotonic()
+
+        # Keep /proc files open on Linux; None means use psutil instead
+        self._meminfo_fd = _open_proc('/proc/meminfo')
+        self._stat_fd = _open_proc('/proc/stat')
+
+        # Prime the CPU counter so later non-blocking samples have a baseline
+        self._prev_cpu_times = (0, 0)
+        self._get_cpu_percent()
+        self._cpu_sampled_at = time.monotonic()
+        # Sensor files held open for pread, set by _detect_temp_reader
+        self._thermal_fd = None
+        self._hwmon_fd = None
+        self._temp_reader = self._detect_temp_reader()
 
         # Telegram configuration
         self.telegram_config = {
@@ -51,37 +172,34 @@ class SystemMonitor:
             'chat_id': TELEGRAM_CHAT_ID
         }
 
-    def _get_os_info(self):
-        """Get detailed OS information"""
-        try:
-            # Get basic OS info
-            os_name = platform.system()
-            if os_name == "Linux":
-                # Try to get Linux distribution info
-                try:
-                    # Try reading from os-release file first
-                    with open("/etc/os-release") as f:
-                        lines = f.readlines()
-                        os_info = {}
-                        for line in lines:
-                            if "=" in line:
-                                key, value = line.rstrip().split("=", 1)
-                                os_info[key] = value.strip('"')
-                        if "PRETTY_NAME" in os_info:
-                            return os_info["PRETTY_NAME"]
-                except:
-                    # Fallback to lsb_release command
-                    try:
-                        os_info = subprocess.check_output(['lsb_release', '-ds']).decode().strip()
-                        return os_info
-                    except:
-                        pass
-            
-            # Fallback to basic platform info
-            return f"{platform.system()} {platform.release()}"
-        except Exception as e:
-            logging.error(f"Error getting OS info: {e}")
-            return f"{platform.system()} {platform.release()}"
+        # Skip all network traffic if the token or chat ID was never filled in
+        self._telegram_enabled = (
+            TELEGRAM_BOT_TOKEN not in ("", "telegram_token")
+            and TELEGRAM_CHAT_ID not in ("", "telegram_chat_id")
+        )
+        if not self._telegram_enabled:
+            logging.warning("Telegram token or chat ID not configured, messages will not be sent")
+
+        # Persistent HTTPS session so the Telegram connection is reused
+        self._session = requests.Session()
+        # urllib3 only retries failed connects; HTTP status retries are
+        # handled in send_telegram_message so they are not stacked
+        retries = Retry(total=3, connect=3, read=0, status=0, backoff_factor=1)
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=retries)
+        )
+
+    def close(self):
+        """Close the /proc and sensor files held open for pread"""
+        for attr in ('_meminfo_fd', '_stat_fd', '_thermal_fd', '_hwmon_fd'):
+            fd = getattr(self, attr, None)
+            if fd is not None:
+                os.close(fd)
+                setattr(self, attr, None)
+
+    def __del__(self):
+        self.close()
 
     def _get_network_bytes(self):
         """Get current network bytes"""
@@ -92,132 +210,238 @@ class SystemMonitor:
         """Calculate network speed"""
         try:
             current_bytes = self._get_network_bytes()
-            sent_speed = (current_bytes[0] - self.prev_network_bytes[0]) / self.alert_interval
-            recv_speed = (current_bytes[1] - self.prev_network_bytes[1]) / self.alert_interval
+            # Divide by the real time since the last sample, callers vary
+            now = time.monotonic()
+            elapsed = now - self.prev_net_ts
+            if elapsed <= 0:
+                return "N/A"
+            sent_speed = (current_bytes[0] - self.prev_network_bytes[0]) / elapsed
+            recv_speed = (current_bytes[1] - self.prev_network_bytes[1]) / elapsed
             self.prev_network_bytes = current_bytes
+            self.prev_net_ts = now
             return f"↑ {sent_speed/1024:.2f} KB/s | ↓ {recv_speed/1024:.2f} KB/s"
         except:
             return "N/A"
 
-    def get_cpu_temperature(self):
-        """Get CPU temperature with multiple methods"""
-        try:
-            # Method 1: Using psutil
-            if hasattr(psutil, "sensors_temperatures"):
-                temps = psutil.sensors_temperatures()
-                if temps:
-                    for name, entries in temps.items():
-                        for entry in entries:
-                            if any(x in entry.label.lower() for x in ['core', 'cpu', 'package']):
-                                return f"{entry.current}°C"
-
-            # Method 2: Try reading from thermal zone on Linux
-            if os.path.exists('/sys/class/thermal/thermal_zone0/temp'):
-                with open('/sys/class/thermal/thermal_zone0/temp') as f:
-                    temp = int(f.read()) / 1000.0
-                    return f"{temp}°C"
-
-            # Method 3: Using vcgencmd for Raspberry Pi
-            if os.path.exists('/opt/vc/bin/vcgencmd'):
-                temp = subprocess.check_output(['/opt/vc/bin/vcgencmd', 'measure_temp'])
-                return temp.decode('utf-8').replace('temp=', '').strip()
-            
-            # Method 4: Using sensors command
+    def _read_psutil_temp(self):
+        """Method 1: CPU temperature from psutil sensors"""
+        for name, entries in psutil.sensors_temperatures().items():
+            for entry in entries:
+                if any(x in entry.label.lower() for x in ['core', 'cpu', 'package']):
+                    return f"{entry.current}°C"
+        return None
+
+    def _read_thermal_zone_temp(self):
+        """Method 2: CPU temperature from the Linux thermal zone"""
+        temp = int(os.pread(self._thermal_fd, 16, 0)) / 1000.0
+        return f"{temp}°C"
+
+    def _read_hwmon_temp(self):
+        """Method 3: CPU temperature from the hwmon file found at startup"""
+        temp = int(os.pread(self._hwmon_fd, 16, 0)) / 1000.0
+        return f"{temp}°C"
+
+    def _detect_temp_reader(self):
+        """Probe each temperature method once and return the first that works"""
+        readers = []
+        if hasattr(psutil, "sensors_temperatures"):
+            readers.append(self._read_psutil_temp)
+        # Sysfs paths are stable, so open once and pread on every sample
+        if os.path.exists('/sys/class/thermal/thermal_zone0/temp'):
             try:
-                temp = subprocess.check_output(['sensors']).decode()
-                for line in temp.split('\n'):
-                    if 'Core 0' in line:
-                        return line.split('+')[1].split('°')[0].strip() + '°C'
-            except:
-                pass
+                self._thermal_fd = os.open('/sys/class/thermal/thermal_zone0/temp', os.O_RDONLY)
+                readers.append(self._read_thermal_zone_temp)
+            except OSError as e:
+                logging.warning(f"Cannot open thermal zone sensor: {e}")
+        hwmon_paths = sorted(glob.glob('/sys/class/hwmon/hwmon*/temp*_input'))
+        if hwmon_paths:
+            try:
+                self._hwmon_fd = os.open(hwmon_paths[0], os.O_RDONLY)
+                readers.append(self._read_hwmon_temp)
+            except OSError as e:
+                logging.warning(f"Cannot open hwmon sensor {hwmon_paths[0]}: {e}")
+
+        winner = None
+        for reader in readers:
+            try:
+                if reader() is not None:
+                    winner = reader
+                    break
+            except Exception as e:
+                logging.warning(f"Temperature method {reader.__name__} unavailable: {e}")
+
+        # Only the winning reader's sensor file stays open
+        for attr, reader in (('_thermal_fd', self._read_thermal_zone_temp),
+                             ('_hwmon_fd', self._read_hwmon_temp)):
+            fd = getattr(self, attr)
+            if fd is not None and reader != winner:
+                os.close(fd)
+                setattr(self, attr, None)
 
+        if winner is None:
+            logging.warning("No CPU temperature source found, reporting N/A")
+        return winner
+
+    @_ttl_cache(seconds=5)
+    def get_cpu_temperature(self):
+        """Get CPU temperature using the method detected at startup"""
+        if self._temp_reader is None:
             return "N/A"
+        try:
+            return self._temp_reader() or "N/A"
         except Exception as e:
             logging.error(f"Error reading CPU temperature: {e}")
             return "N/A"
 
-    def get_disk_usage(self):
-        """Get disk usage for all mounted partitions excluding /snap"""
-        disk_usage = {}
+    def _read_proc_meminfo(self):
+        """Read MemTotal, MemAvailable, SwapTotal and SwapFree in bytes"""
+        data = os.pread(self._meminfo_fd, 4096, 0)
+        return {key.decode(): int(value) * 1024 for key, value in _MEMINFO_RE.findall(data)}
+
+    def _read_proc_stat(self):
+        """Read aggregate (busy, total) CPU time from /proc/stat"""
+        data = os.pread(self._stat_fd, 4096, 0)
+        # user nice system idle iowait irq softirq steal (guest is already in user)
+        times = [int(x) for x in data.split(b'\n', 1)[0].split()[1:9]]
+        total = sum(times)
+        return total - times[3] - times[4], total
+
+    def _get_cpu_percent(self):
+        """Get CPU usage since the previous call, None if no time has passed"""
+        if self._stat_fd is None:
+            return psutil.cpu_percent(interval=None)
+
+        busy, total = self._read_proc_stat()
+        prev_busy, prev_total = self._prev_cpu_times
+        self._prev_cpu_times = (busy, total)
+        if total <= prev_total:
+            return None
+        return round(100.0 * (busy - prev_busy) / (total - prev_total), 1)
+
+    def _get_memory(self):
+        """Get (total, used, percent, swap_used, swap_percent) for RAM and swap"""
+        if self._meminfo_fd is not None:
+            mem = self._read_proc_meminfo()
+            if len(mem) == 4:
+                used = mem['MemTotal'] - mem['MemAvailable']
+                swap_used = mem['SwapTotal'] - mem['SwapFree']
+                return (
+                    mem['MemTotal'],
+                    used,
+                    round(100.0 * used / mem['MemTotal'], 1),
+                    swap_used,
+                    round(100.0 * swap_used / mem['SwapTotal'], 1) if mem['SwapTotal'] else 0.0
+                )
+
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        return memory.total, memory.used, memory.percent, swap.used, swap.percent
+
+    @_ttl_cache(seconds=3600)
+    def _get_partitions(self):
+        """Get mounted partitions excluding /snap, re-read hourly"""
+        partitions = []
         for partition in psutil.disk_partitions():
             try:
                 # Skip if mountpoint is or contains /snap
                 if '/snap' in partition.mountpoint:
                     continue
-                    
-                # Skip if the partition's root path contains /snap
-                root_path = os.path.realpath(partition.mountpoint)
-                if '/snap' in root_path:
-                    continue
 
+                # Mount table paths are already resolved; only squashfs (snap
+                # images) is worth checking through realpath
+                if partition.fstype == 'squashfs':
+                    root_path = os.path.realpath(partition.mountpoint)
+                    if '/snap' in root_path:
+                        continue
+
+                partitions.append(partition)
+            except Exception as e:
+                logging.error(f"Error checking partition {partition.mountpoint}: {e}")
+        return partitions
+
+    @_ttl_cache(seconds=60)
+    def get_disk_usage(self):
+        """Get disk usage for all mounted partitions excluding /snap"""
+        disk_usage = {}
+        for partition in self._get_partitions():
+            try:
                 usage = psutil.disk_usage(partition.mountpoint)
                 disk_usage[partition.mountpoint] = {
                     'percent': usage.percent,
-                    'total': f"{usage.total / (1024**3):.1f}GB",
-                    'used': f"{usage.used / (1024**3):.1f}GB",
-                    'free': f"{usage.free / (1024**3):.1f}GB"
+                    'total_bytes': usage.total,
+                    'used_bytes': usage.used,
+                    'free_bytes': usage.free
                 }
             except Exception as e:
                 logging.error(f"Error getting disk usage for {partition.mountpoint}: {e}")
         return disk_usage
 
+    @_ttl_cache(seconds=10)
     def get_system_metrics(self):
         """Get comprehensive system metrics"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Usage since the previous call; only wait out the remainder of
+            # a 1s window when the last sample was taken very recently
+            wait = self._cpu_sampled_at + 1 - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            cpu_percent = self._get_cpu_percent()
+            self._cpu_sampled_at = time.monotonic()
             cpu_freq = psutil.cpu_freq()
-            memory = psutil.virtual_memory()
-            swap = psutil.swap_memory()
+            memory_total, memory_used, memory_percent, swap_used, swap_percent = self._get_memory()
 
-            return {
+            metrics = {
                 'cpu_percent': cpu_percent,
                 'cpu_freq': f"{cpu_freq.current/1000:.2f}GHz" if cpu_freq else "N/A",
                 'cpu_temp': self.get_cpu_temperature(),
-                'memory_total': f"{memory.total / (1024**3):.2f}GB",
-                'memory_used': f"{memory.used / (1024**3):.2f}GB",
-                'memory_percent': memory.percent,
-                'swap_used': f"{swap.used / (1024**3):.2f}GB",
-                'swap_percent': swap.percent,
+                'memory_total_bytes': memory_total,
+                'memory_used_bytes': memory_used,
+                'memory_percent': memory_percent,
+                'swap_used_bytes': swap_used,
+                'swap_percent': swap_percent,
                 'network_speed': self.get_network_speed()
             }
+            return metrics
         except Exception as e:
             logging.error(f"Error getting system metrics: {e}")
             return {}
 
-    def send_telegram_message(self, title, message_type="status"):
-        """Send message via Telegram"""
+    def send_telegram_message(self, title, *, metrics=None, disk_usage=None, message_type="status"):
+        """Send message via Telegram, reusing a metrics snapshot when given"""
+        if not self._telegram_enabled:
+            return
+
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            metrics = self.get_system_metrics()
-            disk_usage = self.get_disk_usage()
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+            if metrics is None:
+                metrics = self.get_system_metrics()
+            if disk_usage is None:
+                disk_usage = self.get_disk_usage()
 
             # Create detailed disk usage string
-            disk_info = []
-            for mount, usage in disk_usage.items():
-                disk_info.append(
-                    f"💽 {mount}:\n"
-                    f"   Used: {usage['used']}/{usage['total']} ({usage['percent']}%)\n"
-                    f"   Free: {usage['free']}"
-                )
-            disk_info = "\n".join(disk_info)
-
-            icon = "⚠" if message_type == "alert" else "ℹ"
-
-            message = (
-                f"{icon} <b>{title}</b>\n\n"
-                f"🖥 Server: <b>{self.server_name}</b>\n"
-                f"💻 OS: {self.os_info}\n"
-                f"🔧 Architecture: {self.arch_info}\n"
-                f"🕒 Time: {timestamp}\n\n"
-                f"📊 System Metrics:\n"
-                f"CPU Usage: {metrics.get('cpu_percent', 'N/A')}%\n"
-                f"CPU Frequency: {metrics.get('cpu_freq', 'N/A')}\n"
-                f"CPU Temperature: {metrics.get('cpu_temp', 'N/A')}\n"
-                f"RAM Used: {metrics.get('memory_used', 'N/A')}/{metrics.get('memory_total', 'N/A')} "
-                f"({metrics.get('memory_percent', 'N/A')}%)\n"
-                f"Swap Used: {metrics.get('swap_used', 'N/A')} ({metrics.get('swap_percent', 'N/A')}%)\n"
-                f"Network: {metrics.get('network_speed', 'N/A')}\n\n"
-                f"Storage Usage:\n{disk_info}"
+            disk_info = "\n".join(
+                f"💽 {mount}:\n"
+                f"   Used: {_fmt_gb(usage['used_bytes'], 1)}/{_fmt_gb(usage['total_bytes'], 1)} "
+                f"({usage['percent']}%)\n"
+                f"   Free: {_fmt_gb(usage['free_bytes'], 1)}"
+                for mount, usage in disk_usage.items()
+            )
+
+            message = MSG_TEMPLATE.format(
+                icon=ICONS.get(message_type, "ℹ"),
+                title=title,
+                header=self._msg_header,
+                timestamp=timestamp,
+                cpu_percent=_or_na(metrics.get('cpu_percent'), "%"),
+                cpu_freq=metrics.get('cpu_freq', 'N/A'),
+                cpu_temp=metrics.get('cpu_temp', 'N/A'),
+                memory_used=_fmt_gb(metrics.get('memory_used_bytes')),
+                memory_total=_fmt_gb(metrics.get('memory_total_bytes')),
+                memory_percent=metrics.get('memory_percent', 'N/A'),
+                swap_used=_fmt_gb(metrics.get('swap_used_bytes')),
+                swap_percent=metrics.get('swap_percent', 'N/A'),
+                network_speed=metrics.get('network_speed', 'N/A'),
+                disk_info=disk_info
             )
 
             url = f"https://api.telegram.org/bot{self.telegram_config['bot_token']}/sendMessage"
@@ -226,7 +450,24 @@ class SystemMonitor:
                 "text": message,
                 "parse_mode": "HTML"
             }
-            response = requests.post(url, data=data)
+            attempts = 3
+            for attempt in range(attempts):
+                response = self._session.post(url, data=data, timeout=10)
+
+                if response.status_code == 429:
+                    # Rate limited: wait as long as Telegram asks
+                    delay = _get_retry_after(response)
+                elif response.status_code >= 500:
+                    # Transient server error: exponential backoff with jitter
+                    delay = 2 ** attempt + random.uniform(0, 1)
+                else:
+                    break
+
+                if attempt + 1 < attempts:
+                    logging.warning(
+                        f"Telegram returned {response.status_code}, retrying in {delay:.1f}s"
+                    )
+                    time.sleep(delay)
 
             if response.status_code == 200:
                 logging.info(f"Telegram message sent: {title}")
@@ -237,81 +478,98 @@ class SystemMonitor:
             logging.error(f"Error sending Telegram message: {e}")
 
     def check_thresholds(self):
-        """Check system resources against thresholds"""
+        """Check system resources against thresholds, return remaining headroom"""
+        # Collect one snapshot and share it with every alert sent this cycle
         metrics = self.get_system_metrics()
         disk_usage = self.get_disk_usage()
 
+        # Collect every triggered condition and send them as one message
+        alerts = []
+
         # Check RAM
         if metrics.get('memory_percent', 0) >= self.threshold:
-            self.send_telegram_message(
-                "High RAM Usage Alert",
-                message_type="alert"
-            )
+            alerts.append("High RAM Usage")
 
         # Check Swap
         if metrics.get('swap_percent', 0) >= self.threshold:
-            self.send_telegram_message(
-                "High Swap Usage Alert",
-                message_type="alert"
-            )
+            alerts.append("High Swap Usage")
 
-        # Check CPU
-        if metrics.get('cpu_percent', 0) >= self.threshold:
-            self.send_telegram_message(
-                "High CPU Usage Alert",
-                message_type="alert"
-            )
+        # Check CPU (skipped when there is no sample this cycle)
+        cpu_percent = metrics.get('cpu_percent')
+        if cpu_percent is not None and cpu_percent >= self.threshold:
+            alerts.append("High CPU Usage")
 
         # Check Disk (excluding /snap)
         for mountpoint, usage in disk_usage.items():
             if usage['percent'] >= self.threshold:
-                self.send_telegram_message(
-                    f"High Disk Usage Alert for {mountpoint}",
-                    message_type="alert"
-                )
+                alerts.append(f"High Disk Usage for {mountpoint}")
                 break
 
+        if alerts:
+            self.send_telegram_message(
+                "Alerts: " + ", ".join(alerts),
+                metrics=metrics,
+                disk_usage=disk_usage,
+                message_type="alert"
+            )
+
+        if not metrics:
+            return None
+
+        # Distance between the busiest resource and the threshold
+        peak = max(
+            [cpu_percent or 0, metrics.get('memory_percent', 0), metrics.get('swap_percent', 0)]
+            + [usage['percent'] for usage in disk_usage.values()]
+        )
+        return self.threshold - peak
+
     def alert_monitor(self):
-        """Continuous monitoring for alerts"""
-        while True:
-            try:
-                self.check_thresholds()
-                time.sleep(self.alert_interval)
-            except Exception as e:
-                logging.error(f"Error in alert monitoring: {e}")
-                time.sleep(self.alert_interval)
+        """Run one alert check and return seconds until the next one"""
+        try:
+            headroom = self.check_thresholds()
+        except Exception as e:
+            logging.error(f"Error in alert monitoring: {e}")
+            return self.alert_interval
+
+        # Keep the regular cadence on errors or while alerts are firing
+        if headroom is None or headroom <= 0:
+            return self.alert_interval
+
+        # Back off while far below the threshold, poll faster when close
+        delay = (self.alert_interval / 4) * 2 ** (headroom / 10)
+        return min(max(delay, 30), self.alert_interval * 4)
 
     def status_update(self):
-        """Regular status update monitoring"""
-        while True:
-            try:
-                self.send_telegram_message("Regular Status Update")
-                time.sleep(self.status_interval)
-            except Exception as e:
-                logging.error(f"Error in status update: {e}")
-                time.sleep(self.status_interval)
+        """Send one regular status update and return seconds until the next one"""
+        try:
+            self.send_telegram_message("Regular Status Update")
+        except Exception as e:
+            logging.error(f"Error in status update: {e}")
+        return self.status_interval
 
     def start_monitoring(self):
-        """Start all monitoring threads"""
+        """Run alert checks and status updates from a single scheduler loop"""
         logging.info(f"Starting system monitoring for server: {self.server_name}")
 
         # Send startup notification
         self.send_telegram_message("Monitoring Started")
 
         try:
-            # Create and start monitoring threads
-            alert_thread = threading.Thread(target=self.alert_monitor)
-            status_thread = threading.Thread(target=self.status_update)
-
-            alert_thread.daemon = True
-            status_thread.daemon = True
-
-            alert_thread.start()
-            status_thread.start()
+            # Each job returns the delay before it should run again
+            jobs = {
+                'alert': self.alert_monitor,
+                'status': self.status_update
+            }
+            now = time.monotonic()
+            schedule = [(now, 'alert'), (now, 'status')]
+            heapq.heapify(schedule)
 
-            # Keep main thread alive
+            # Sleep until the next due job instead of waking every second
             while True:
-                time.sleep(1)
+                next_ts, kind = heapq.heappop(schedule)
+                time.sleep(max(0, next_ts - time.monotonic()))
+                delay = jobs[kind]()
+                heapq.heappush(schedule, (next_ts + delay, kind))
 
         except KeyboardInterrupt:
             logging.info("Monitoring stopped by user")